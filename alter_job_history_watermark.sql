@@ -0,0 +1,8 @@
+-- High-water mark columns used by IncrementalSync in postgresql.py
+ALTER TABLE etl.job_history ADD COLUMN IF NOT EXISTS watermark_type text;
+ALTER TABLE etl.job_history ADD COLUMN IF NOT EXISTS watermark_value text;
+ALTER TABLE etl.job_history ADD COLUMN IF NOT EXISTS row_count bigint;
+
+CREATE INDEX IF NOT EXISTS job_history_watermark_idx
+    ON etl.job_history (table_name, tag, watermark_type, id DESC)
+    WHERE status = 'loaded';
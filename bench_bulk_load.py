@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+"""
+Bulk-load benchmark for BulkDb and DatabaseConnection.
+
+Generates synthetic client shaped data (id, email, date_of_birth, is_active, phone_number,
+first_name, last_name, postal_code), runs every insert/fetch path against a local Postgres
+and writes one JSON line per case, so results can be diffed across versions.
+
+Example usage:
+    python bench_bulk_load.py --dsn "host=localhost dbname=etl user=etl" \\
+        --rows 10000,100000 --block-sizes 1000,3000 --concurrency 1,4 --output bench_output.txt
+"""
+
+import argparse
+import json
+import multiprocessing
+import platform
+import random
+import sys
+import time
+from queue import Empty
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+from postgresql import DatabaseConnection, BulkDb, current_rss_mb, peak_rss_mb
+
+INSERT_PATHS = ('insert_dynamic', 'insert_cast')
+FETCH_PATHS = ('fetch_all_rows', 'streaming_cursor')
+
+DEFAULT_TABLE = 'data.client_bench'
+DEFAULT_ROWS = '10000,100000,1000000'
+DEFAULT_BLOCK_SIZES = '1000,3000,10000'
+DEFAULT_CONCURRENCY = '1'
+RESULT_POLL_SECONDS = 1
+
+FIRST_NAMES = ('thach', 'anna', 'minh', 'john', 'linh', 'maria', 'david', 'hoa', 'james', 'lan')
+LAST_NAMES = ('bui', 'nguyen', 'smith', 'tran', 'jones', 'le', 'brown', 'pham', 'miller', 'vo')
+
+CREATE_TABLE = '''
+CREATE TABLE IF NOT EXISTS {table} (
+    id bigint PRIMARY KEY,
+    email text,
+    date_of_birth date,
+    is_active boolean,
+    phone_number text,
+    first_name text,
+    last_name text,
+    postal_code text
+)
+'''
+COLUMNS = 'id, email, date_of_birth, is_active, phone_number, first_name, last_name, postal_code'
+DYNAMIC_TEMPLATE = '(%s, %s, %s, %s, %s, %s, %s, %s)'
+CAST_TEMPLATE = ("({id}, '{email}', '{date_of_birth}'::date, '{is_active}'::boolean, '{phone_number}'"
+                 ", '{first_name}', '{last_name}', '{postal_code}')")
+
+
+def generate_clients(rows, seed=42):
+    """
+    Generate synthetic client rows as lists, in the column order of COLUMNS.
+    The same seed always produces the same dataset.
+    """
+    rng = random.Random(seed)
+    first_day = date(1950, 1, 1)
+    data = []
+    for client_id in range(1, rows + 1):
+        first_name = rng.choice(FIRST_NAMES)
+        last_name = rng.choice(LAST_NAMES)
+        data.append([
+            client_id,
+            f"{first_name}.{last_name}{client_id}@email.com",
+            (first_day + timedelta(days=rng.randrange(25000))).isoformat(),
+            rng.random() < 0.8,
+            f"{rng.randrange(100, 1000)}-{rng.randrange(100, 1000)}-{rng.randrange(1000, 10000)}",
+            first_name,
+            last_name,
+            f"{rng.randrange(10000, 100000)}"
+        ])
+    return data
+
+
+def to_dicts(data):
+    """Converts generated rows to the dicts used by insert_cast templates."""
+    keys = [column.strip() for column in COLUMNS.split(',')]
+    return [dict(zip(keys, row)) for row in data]
+
+
+class RoundTripCounter:
+    """
+    Counts statements sent to the server by a DatabaseConnection.
+    Each execute_query, execute_row or streaming_cursor call is counted as one round trip.
+    """
+
+    def __init__(self, db):
+        self.db = db
+        self.round_trips = 0
+        self._execute_query = db.execute_query
+        self._execute_row = db.execute_row
+        self._streaming_cursor = db.streaming_cursor
+        db.execute_query = self.execute_query
+        db.execute_row = self.execute_row
+        db.streaming_cursor = self.streaming_cursor
+
+    def execute_query(self, *args, **kwargs):
+        self.round_trips += 1
+        return self._execute_query(*args, **kwargs)
+
+    def execute_row(self, *args, **kwargs):
+        self.round_trips += 1
+        return self._execute_row(*args, **kwargs)
+
+    def streaming_cursor(self, *args, **kwargs):
+        self.round_trips += 1
+        return self._streaming_cursor(*args, **kwargs)
+
+
+def connect(config):
+    db = DatabaseConnection(config)
+    return db, RoundTripCounter(db)
+
+
+def run_insert(config, table, path, data, block_size, count_inserted):
+    """Runs one insert path on its own connection, returns the round trip count."""
+    db, counter = connect(config)
+    try:
+        bulk = BulkDb(db, inserted_count=count_inserted)
+        header = f"insert into {table}({COLUMNS})"
+        if path == 'insert_dynamic':
+            bulk.insert_dynamic(header=header, template=DYNAMIC_TEMPLATE, data=data, block_size=block_size)
+        else:
+            bulk.insert_cast(header=header, template=CAST_TEMPLATE, data=to_dicts(data), block_size=block_size)
+        return counter.round_trips
+    finally:
+        db.close()
+
+
+def run_fetch(config, table, path, part, concurrency):
+    """Runs one fetch path on its own connection, returns the fetched row and round trip counts."""
+    db, counter = connect(config)
+    try:
+        sql = f"select {COLUMNS} from {table} where id %% %s = %s"
+        args = (concurrency, part)
+        if path == 'fetch_all_rows':
+            fetched = len(db.fetch_all_rows(sql, args).query_data)
+        else:
+            fetched = sum(1 for _ in db.streaming_cursor(sql, args))
+        return fetched, counter.round_trips
+    finally:
+        db.close()
+
+
+def count_rows(config, table):
+    """Returns the number of rows in the benchmark table."""
+    db = DatabaseConnection(config)
+    try:
+        return db.fetch_one_row(f"select count(*) as row_count from {table}").query_data.row_count
+    finally:
+        db.close()
+
+
+def run_case(config, table, path, rows, block_size, concurrency, count_inserted, queue):
+    """
+    Runs one benchmark case in a child process so peak RSS is measured per case.
+    The result dict is put on the queue, with an error key if the case failed.
+    """
+    try:
+        queue.put(measure_case(config, table, path, rows, block_size, concurrency, count_inserted))
+    except Exception as error:
+        queue.put({'path': path, 'block_size': block_size, 'concurrency': concurrency, 'error': repr(error)})
+
+
+def measure_case(config, table, path, rows, block_size, concurrency, count_inserted):
+    """Runs one benchmark case and returns its result dict."""
+    error = None
+    if path in INSERT_PATHS:
+        # Only the insert paths need the dataset in memory, fetch paths read the prepared table
+        data = generate_clients(rows)
+        rss_before_mb = current_rss_mb()
+        start_time = time.perf_counter()
+        chunk = -(-rows // concurrency)
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            round_trips = sum(executor.map(
+                lambda start: run_insert(config, table, path, data[start:start + chunk], block_size, count_inserted),
+                range(0, rows, chunk)
+            ))
+        seconds = time.perf_counter() - start_time
+
+        # execute_query logs and swallows failed blocks, so count what actually landed
+        processed = count_rows(config, table)
+        if processed != rows:
+            error = f"expected {rows} rows in {table}, found {processed}"
+    else:
+        rss_before_mb = current_rss_mb()
+        start_time = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            results = list(executor.map(
+                lambda part: run_fetch(config, table, path, part, concurrency),
+                range(concurrency)
+            ))
+        seconds = time.perf_counter() - start_time
+        processed = sum(fetched for fetched, _ in results)
+        round_trips = sum(trips for _, trips in results)
+        if processed != rows:
+            error = f"expected {rows} rows fetched from {table}, got {processed}"
+
+    result = {
+        'path': path,
+        'rows': processed,
+        'block_size': block_size if path in INSERT_PATHS else None,
+        'concurrency': concurrency,
+        'seconds': round(seconds, 4),
+        'rows_per_sec': round(processed / seconds, 1) if seconds else None,
+        'rss_before_mb': round(rss_before_mb, 1),
+        'peak_rss_mb': round(peak_rss_mb(), 1),
+        'round_trips': round_trips
+    }
+    if error:
+        result['error'] = error
+    return result
+
+
+def wait_for_result(process, queue):
+    """Waits for the result of a case, returns an error result if the child process died without one."""
+    while True:
+        try:
+            return queue.get(timeout=RESULT_POLL_SECONDS)
+        except Empty:
+            if not process.is_alive():
+                try:
+                    return queue.get_nowait()
+                except Empty:
+                    return {'error': f"benchmark process exited with code {process.exitcode}"}
+
+
+def reset_table(config, table, rows=None):
+    """Recreates the benchmark table, optionally filled with rows for the fetch paths."""
+    db = DatabaseConnection(config)
+    try:
+        db.modify_rows(CREATE_TABLE.format(table=table))
+        db.modify_rows(f"truncate table {table}")
+        if rows:
+            header = f"insert into {table}({COLUMNS})"
+            BulkDb(db, inserted_count=False).insert_dynamic(header=header, template=DYNAMIC_TEMPLATE,
+                                                            data=generate_clients(rows), block_size=3000)
+    finally:
+        db.close()
+
+
+def run_benchmark(config, table, paths, row_counts, block_sizes, concurrency_levels, count_inserted, label):
+    """Generator running every combination of the parameters, yielding one result dict per case."""
+    context = multiprocessing.get_context('spawn')
+    environment = {
+        'label': label,
+        'python': platform.python_version(),
+        'platform': platform.platform()
+    }
+
+    for rows in row_counts:
+        cases = []
+        for path in paths:
+            if path in INSERT_PATHS:
+                cases += [(path, block_size, concurrency) for block_size in block_sizes
+                          for concurrency in concurrency_levels]
+            else:
+                cases += [(path, None, concurrency) for concurrency in concurrency_levels]
+
+        fetch_table_ready = False
+        for path, block_size, concurrency in cases:
+            if path in INSERT_PATHS:
+                reset_table(config, table)
+                fetch_table_ready = False
+            elif not fetch_table_ready:
+                reset_table(config, table, rows=rows)
+                fetch_table_ready = True
+
+            queue = context.Queue()
+            process = context.Process(target=run_case, args=(config, table, path, rows, block_size,
+                                                             concurrency, count_inserted, queue))
+            process.start()
+            result = wait_for_result(process, queue)
+            process.join()
+            case = dict(environment, path=path, block_size=block_size, concurrency=concurrency, dataset_rows=rows)
+            case.update(result)
+            yield case
+
+
+def parse_int_list(value):
+    return [int(item) for item in value.split(',') if item]
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Bulk-load benchmark for BulkDb and DatabaseConnection')
+    parser.add_argument('--dsn', help='libpq connection string, defaults to main.config.db_config')
+    parser.add_argument('--table', default=DEFAULT_TABLE, help='benchmark table, recreated for every case')
+    parser.add_argument('--paths', default=','.join(INSERT_PATHS + FETCH_PATHS),
+                        help='comma separated paths to run')
+    parser.add_argument('--rows', type=parse_int_list, default=DEFAULT_ROWS, help='comma separated dataset sizes')
+    parser.add_argument('--block-sizes', type=parse_int_list, default=DEFAULT_BLOCK_SIZES,
+                        help='comma separated block sizes for the insert paths')
+    parser.add_argument('--concurrency', type=parse_int_list, default=DEFAULT_CONCURRENCY,
+                        help='comma separated number of concurrent connections')
+    parser.add_argument('--count-inserted', action='store_true',
+                        help='insert with RETURNING id like BulkDb(inserted_count=True)')
+    parser.add_argument('--label', default='', help='free text stored with every result, e.g. a git revision')
+    parser.add_argument('--output', help='JSON lines output file, defaults to stdout')
+    args = parser.parse_args(argv)
+
+    args.paths = [path for path in args.paths.split(',') if path]
+    unknown = set(args.paths) - set(INSERT_PATHS + FETCH_PATHS)
+    if unknown:
+        parser.error(f"unknown paths: {', '.join(sorted(unknown))}")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    # None lets DatabaseConnection resolve main.config.db_config when connecting
+    config = {'dsn': args.dsn} if args.dsn else None
+
+    output = open(args.output, 'w') if args.output else sys.stdout
+    try:
+        for result in run_benchmark(config, args.table, args.paths, args.rows, args.block_sizes,
+                                    args.concurrency, args.count_inserted, args.label):
+            output.write(json.dumps(result, sort_keys=True) + '\n')
+            output.flush()
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Import-time benchmark for postgresql.py.
+
+Imports the module in a fresh interpreter with -X importtime, fails when the cumulative import time
+is over the budget or when a heavy optional dependency is imported eagerly, and writes the result as JSON.
+
+Example usage:
+    python bench_import_time.py --max-ms 150 --output bench_output.txt
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+DEFAULT_MODULE = 'postgresql'
+DEFAULT_MAX_MS = 150
+DEFAULT_RUNS = 5
+FORBIDDEN_MODULES = ('pandas', 'numpy', 'pyarrow', 'main.config')
+TOP_IMPORTS = 10
+
+current_file_dir = os.path.dirname(os.path.abspath(__file__))
+
+
+def measure_import(module):
+    """
+    Imports a module in a fresh interpreter with -X importtime.
+
+    :return: A dict of imported module name to (self us, cumulative us)
+    """
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=current_file_dir, capture_output=True, text=True
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{completed.stderr}")
+
+    imports = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        imports[name.strip()] = (int(self_us), int(cumulative_us))
+    return imports
+
+
+def run_benchmark(module, runs):
+    """Measures the import several times and keeps the fastest run, the least noisy one."""
+    best = None
+    for _ in range(runs):
+        imports = measure_import(module)
+        if best is None or imports[module][1] < best[module][1]:
+            best = imports
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Import-time benchmark for postgresql.py')
+    parser.add_argument('--module', default=DEFAULT_MODULE, help='module to import')
+    parser.add_argument('--max-ms', type=float, default=DEFAULT_MAX_MS, help='cumulative import time budget')
+    parser.add_argument('--runs', type=int, default=DEFAULT_RUNS, help='number of imports, the fastest is kept')
+    parser.add_argument('--output', help='JSON output file, defaults to stdout')
+    args = parser.parse_args(argv)
+
+    imports = run_benchmark(args.module, args.runs)
+    cumulative_ms = imports[args.module][1] / 1000
+    forbidden = sorted(name for name in imports
+                       if any(name == module or name.startswith(module + '.') for module in FORBIDDEN_MODULES))
+    slowest = sorted(imports.items(), key=lambda item: item[1][0], reverse=True)[:TOP_IMPORTS]
+
+    result = {
+        'module': args.module,
+        'python': sys.version.split()[0],
+        'cumulative_ms': round(cumulative_ms, 2),
+        'max_ms': args.max_ms,
+        'module_count': len(imports),
+        'forbidden_imports': forbidden,
+        'slowest_self_ms': {name: round(self_us / 1000, 2) for name, (self_us, _) in slowest}
+    }
+
+    output = json.dumps(result, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, 'w') as file:
+            file.write(output + '\n')
+    else:
+        print(output)
+
+    if forbidden:
+        sys.exit(f"{args.module} eagerly imports {', '.join(forbidden)}")
+    if cumulative_ms > args.max_ms:
+        sys.exit(f"import {args.module} took {cumulative_ms:.1f} ms, budget is {args.max_ms} ms")
+
+
+if __name__ == '__main__':
+    main()
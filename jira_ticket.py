@@ -1,13 +1,33 @@
+import logging
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
 import requests
-import json
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger("JiraClient")
 
 # JIRA server details
 JIRA_SERVER = ''
-JIRA_API_ENDPOINT = f'{JIRA_SERVER}/rest/api/2/issue'
+JIRA_API_ENDPOINT = '/rest/api/2/issue'
+JIRA_BULK_ENDPOINT = '/rest/api/2/issue/bulk'
 
 # JIRA Personal Access Token (PAT)
 JIRA_PAT = ""  # Replace with your actual PAT
 
+# Client settings
+BULK_CHUNK_SIZE = 50  # JIRA accepts at most 50 issues per bulk request
+MAX_WORKERS = 4
+MAX_RETRIES = 5
+BACKOFF_SECONDS = 1
+DEDUPE_WINDOW = 3600
+REQUEST_TIMEOUT = 30
+RETRY_STATUS_CODES = frozenset([429, 503])
+
+BulkResult = namedtuple('BulkResult', ['issues', 'errors', 'skipped'])
+
 # Issue details for Task
 task_data = {
   "fields": {
@@ -24,25 +44,202 @@ task_data = {
   }
 }
 
+
+class JiraError(Exception):
+    """Raised when JIRA keeps rejecting a request after all retries."""
+
+
+class JiraClient:
+    """
+    Create JIRA issues over a pooled keep-alive session.
+
+    Issues are sent through the bulk endpoint in chunks, chunks are submitted concurrently,
+    429/503 responses are retried with backoff and identical summaries are only filed once per window.
+    """
+
+    def __init__(self, server=JIRA_SERVER, token=JIRA_PAT, max_workers=MAX_WORKERS, chunk_size=BULK_CHUNK_SIZE,
+                 max_retries=MAX_RETRIES, dedupe_window=DEDUPE_WINDOW, timeout=REQUEST_TIMEOUT):
+        """
+        Initialize the client and its session.
+
+        Parameters:
+        - server (str): JIRA base url, e.g. "https://jira.example.com" or a local stub server.
+        - token (str): Personal Access Token sent as Bearer token.
+        - max_workers (int): Maximum number of concurrent requests, also the connection pool size.
+        - chunk_size (int): Number of issues per bulk request.
+        - max_retries (int): Number of retries on 429/503 responses.
+        - dedupe_window (int): Seconds during which an identical summary is not filed again, 0 disables it.
+        - timeout (int): Request timeout in seconds.
+        """
+        self.server = server.rstrip('/')
+        self.max_workers = max_workers
+        self.chunk_size = min(chunk_size, BULK_CHUNK_SIZE)
+        self.max_retries = max_retries
+        self.dedupe_window = dedupe_window
+        self.timeout = timeout
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_workers)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers.update({
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {token}"  # Bearer token for authorization
+        })
+
+        self._seen = {}
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Closes the session and its pooled connections."""
+        self.session.close()
+
+    def _post(self, endpoint, payload):
+        """Posts a payload, retrying rate limited responses with Retry-After or exponential backoff."""
+        for attempt in range(self.max_retries + 1):
+            response = self.session.post(self.server + endpoint, json=payload, timeout=self.timeout)
+            if response.status_code not in RETRY_STATUS_CODES:
+                return response
+
+            retry_after = response.headers.get('Retry-After')
+            sleep_time = float(retry_after) if retry_after and retry_after.isdigit() else BACKOFF_SECONDS * 2 ** attempt
+            logger.warning(f'JIRA returned {response.status_code}. Retry in {sleep_time} seconds. '
+                           f'Attempts left: {self.max_retries - attempt}')
+            time.sleep(sleep_time)
+
+        raise JiraError(f'JIRA rate limit not cleared after {self.max_retries} retries: {response.text}')
+
+    def _is_duplicate(self, issue_data):
+        """Returns True if the summary was filed within the dedupe window, otherwise records it."""
+        if not self.dedupe_window:
+            return False
+
+        summary = issue_data["fields"]["summary"]
+        now = time.monotonic()
+        with self._lock:
+            # Summaries are inserted in time order, so expired entries are at the front
+            while self._seen:
+                oldest = next(iter(self._seen))
+                if now - self._seen[oldest] < self.dedupe_window:
+                    break
+                del self._seen[oldest]
+
+            filed_at = self._seen.get(summary)
+            if filed_at is not None and now - filed_at < self.dedupe_window:
+                return True
+            self._seen[summary] = now
+        return False
+
+    def _forget(self, issues):
+        """Removes summaries of issues that failed so they can be filed again."""
+        with self._lock:
+            for issue_data in issues:
+                self._seen.pop(issue_data["fields"]["summary"], None)
+
+    def create_issue(self, issue_data):
+        """
+        Create a single issue.
+        return {'id': '10004', 'key': 'TES-5', 'self': 'http://host_url/rest/api/2/issue/10004'}
+        or None if the issue is a duplicate or failed
+        """
+        if self._is_duplicate(issue_data):
+            logger.info(f'Skipping duplicate issue: {issue_data["fields"]["summary"]}')
+            return None
+
+        try:
+            response = self._post(JIRA_API_ENDPOINT, issue_data)
+        except (JiraError, requests.RequestException) as error:
+            self._forget([issue_data])
+            logger.error(f"Failed to create issue: {error}")
+            return None
+
+        if response.status_code == 201:
+            logger.info(f"Issue created successfully: {response.json()}")
+            return response.json()
+
+        self._forget([issue_data])
+        logger.error(f"Failed to create issue: {response.status_code} {response.text}")
+        return None
+
+    def _create_chunk(self, chunk):
+        """Sends one chunk to the bulk endpoint, returns the created issues and the errors."""
+        try:
+            response = self._post(JIRA_BULK_ENDPOINT, {"issueUpdates": chunk})
+        except (JiraError, requests.RequestException) as error:
+            self._forget(chunk)
+            logger.error(f"Failed to create issues: {error}")
+            return [], [{"status": None, "issue": issue_data, "error": str(error)} for issue_data in chunk]
+
+        try:
+            body = response.json()
+        except ValueError:
+            body = {}
+        if not isinstance(body, dict):
+            body = {}
+
+        # A bulk response lists per-element errors, any other body (e.g. an ErrorCollection
+        # with an errors dict) fails the whole chunk
+        element_errors = body.get("errors") or []
+        if not isinstance(element_errors, list) or not all(isinstance(error, dict) for error in element_errors):
+            element_errors = None
+
+        if element_errors is None or (response.status_code not in (200, 201) and not element_errors):
+            self._forget(chunk)
+            logger.error(f"Failed to create issues: {response.status_code} {response.text}")
+            return [], [{"status": response.status_code, "issue": issue_data, "error": response.text}
+                        for issue_data in chunk]
+
+        errors = []
+        for error in element_errors:
+            position = error.get("failedElementNumber")
+            if isinstance(position, int) and 0 <= position < len(chunk):
+                issue_data = chunk[position]
+                self._forget([issue_data])
+            else:
+                issue_data = None
+                logger.error(f"JIRA bulk error without a valid failedElementNumber: {error}")
+            errors.append({"status": error.get("status"), "issue": issue_data,
+                           "error": error.get("elementErrors")})
+        return body.get("issues", []), errors
+
+    def create_issues(self, issues):
+        """
+        Create many issues through the bulk endpoint.
+
+        :param issues: A list of issue dicts shaped like task_data.
+        :return: BulkResult with the created issues, the errors and the number of skipped duplicates.
+        """
+        unique_issues = [issue_data for issue_data in issues if not self._is_duplicate(issue_data)]
+        skipped = len(issues) - len(unique_issues)
+        chunks = [unique_issues[start:start + self.chunk_size]
+                  for start in range(0, len(unique_issues), self.chunk_size)]
+
+        created, errors = [], []
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for chunk_issues, chunk_errors in executor.map(self._create_chunk, chunks):
+                created += chunk_issues
+                errors += chunk_errors
+
+        logger.info(f"Created {len(created)} issues, {len(errors)} failed, {skipped} duplicates skipped")
+        return BulkResult(issues=created, errors=errors, skipped=skipped)
+
+
 def create_issue(issue_data):
     """
     return {'id': '10004', 'key': 'TES-5', 'self': 'http://host_url/rest/api/2/issue/10004'
     """
-  headers = {
-    "Content-Type": "application/json",
-    "Authorization": f"Bearer {JIRA_PAT}"  # Bearer token for authorization
-  }
+    with JiraClient() as client:
+        return client.create_issue(issue_data)
 
-  response = requests.post(
-      JIRA_API_ENDPOINT,
-      headers=headers,
-      json=issue_data
-  )
 
-  if response.status_code == 201:
-      print("Issue created successfully:", response.json())
-  else:
-      print("Failed to create issue:", response.status_code, response.text)
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
 
-# Create Task
-create_issue(task_data)
+    # Create Task
+    create_issue(task_data)
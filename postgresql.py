@@ -3,18 +3,24 @@
 import logging
 import time
 import os
+import resource
+import uuid
 import psycopg2
 import csv
+import hashlib
+import io
+import json
+import mmap
 from decimal import Decimal
 from collections import namedtuple
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from datetime import datetime, timezone
 from psycopg2 import extras, OperationalError
 from psycopg2.extensions import register_adapter
 from main.error import DbConnectError
-from pandas.io import sql as psql
-from main.config import db_config
 
 # Set logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("ETLConnector")
 
 # Constants
@@ -27,7 +33,38 @@ FETCH_ALL = 'all'
 MODIFY = 'modify'
 ON_CONFLICT = ' ON CONFLICT DO NOTHING '
 
+# Export settings
+EXPORT_BUFFER_SIZE = 1024 * 1024
+EXPORT_ROW_GROUP_SIZE = 100000
+
+# Compact fetch settings, type oids stored as typed NumPy arrays
+COMPACT_FETCH_SIZE = 10000
+BOOL_OIDS = frozenset([16])
+INT_OIDS = frozenset([20, 21, 23, 26])
+FLOAT_OIDS = frozenset([700, 701])
+DATE_OIDS = frozenset([1082])
+TIMESTAMP_OIDS = frozenset([1114, 1184])
+NUMERIC_OIDS = frozenset([1700])
+STRING_OIDS = frozenset([25, 1042, 1043])
+BYTES_OIDS = frozenset([17])
+JSON_OIDS = frozenset([114, 3802])
+MAX_DECIMAL_PRECISION = 76
+
+# Incremental sync, watermark types stored in the job history table
+JOB_HISTORY_TABLE = 'etl.job_history'
+WATERMARK_TIMESTAMP = 'timestamp'
+WATERMARK_ID = 'id'
+WATERMARK_CHECKSUM = 'checksum'
+STATUS_LOADED = 'loaded'
+CHECKSUM_BLOCK_SIZE = 1024 * 1024
+
+# Parallel CSV ingest settings
+CSV_CHUNK_SIZE = 16 * 1024 * 1024
+TRUE_VALUES = frozenset(['1', 't', 'true', 'y', 'yes'])
+
 ExecutionResults = namedtuple('ExecutionResults', ['query_data', 'rowcount', 'cursor_description'])
+ExportStats = namedtuple('ExportStats', ['file_path', 'rows', 'bytes_written', 'seconds', 'rows_per_sec',
+                                         'mb_per_sec', 'rss_before_mb', 'rss_after_mb', 'process_peak_rss_mb'])
 
 
 current_file_dir = os.path.dirname(os.path.abspath(__file__))
@@ -49,7 +86,235 @@ def adapt_decimal_to_float(decimal_value):
     return float(decimal_value) if decimal_value is not None else None
 
 
-register_adapter(Decimal, adapt_decimal_to_float)
+def register_adapters():
+    """Registers the psycopg2 adapters of this module, opt-in since they change global psycopg2 state."""
+    register_adapter(Decimal, adapt_decimal_to_float)
+
+
+def configure_logging(level=logging.INFO):
+    """Configures the root logger, opt-in for scripts and jobs that have no logging setup of their own."""
+    logging.basicConfig(level=level)
+
+
+def peak_rss_mb():
+    """Returns the peak resident set size of the current process in MB, a high-water mark for the whole process."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def current_rss_mb():
+    """Returns the current resident set size of the process in MB."""
+    with open('/proc/self/statm') as statm:
+        return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 1024 / 1024
+
+
+def export_stats(file_path, rows, start_time, rss_before_mb):
+    """
+    Builds the ExportStats for a finished export and logs them.
+    rss_before_mb and rss_after_mb belong to this export, process_peak_rss_mb covers the whole process.
+    """
+    seconds = time.perf_counter() - start_time
+    bytes_written = os.path.getsize(file_path)
+    stats = ExportStats(
+        file_path=file_path,
+        rows=rows,
+        bytes_written=bytes_written,
+        seconds=seconds,
+        rows_per_sec=rows / seconds if seconds else 0.0,
+        mb_per_sec=bytes_written / 1024 / 1024 / seconds if seconds else 0.0,
+        rss_before_mb=rss_before_mb,
+        rss_after_mb=current_rss_mb(),
+        process_peak_rss_mb=peak_rss_mb()
+    )
+    logger.info(f"Exported {rows} rows to {file_path} in {seconds:.2f}s "
+                f"({stats.rows_per_sec:.0f} rows/s, {stats.mb_per_sec:.2f} MB/s, "
+                f"RSS {stats.rss_before_mb:.1f} -> {stats.rss_after_mb:.1f} MB)")
+    return stats
+
+
+def arrow_schema(description):
+    """
+    Builds the Arrow schema of a query from its cursor description, so every row group of an
+    export shares the declared column types, whatever values the first rows hold.
+    numeric with a declared precision becomes a decimal, unconstrained numeric (reported with
+    precision 65535) and types without an Arrow mapping are exported as text, see to_text.
+
+    :param description: cursor.description of the executed query
+    :return: The schema and a dict of column position to type oid for the columns to convert to text
+    """
+    import pyarrow as pa
+
+    fields = []
+    text_columns = {}
+    for position, column in enumerate(description):
+        type_code = column.type_code
+        if type_code in BOOL_OIDS:
+            arrow_type = pa.bool_()
+        elif type_code in INT_OIDS:
+            arrow_type = pa.int64()
+        elif type_code in NUMERIC_OIDS and column.precision and column.precision <= MAX_DECIMAL_PRECISION:
+            decimal_type = pa.decimal128 if column.precision <= 38 else pa.decimal256
+            arrow_type = decimal_type(column.precision, column.scale or 0)
+        elif type_code in FLOAT_OIDS:
+            arrow_type = pa.float64()
+        elif type_code in DATE_OIDS:
+            arrow_type = pa.date32()
+        elif type_code == 1184:
+            arrow_type = pa.timestamp('us', tz='UTC')
+        elif type_code in TIMESTAMP_OIDS:
+            arrow_type = pa.timestamp('us')
+        elif type_code in BYTES_OIDS:
+            arrow_type = pa.binary()
+        else:
+            arrow_type = pa.string()
+            if type_code not in STRING_OIDS:
+                text_columns[position] = type_code
+        fields.append(pa.field(column.name, arrow_type))
+    return pa.schema(fields), text_columns
+
+
+def to_text(value, type_code):
+    """
+    Converts a value without an Arrow mapping to text for export_parquet.
+    json/jsonb and arrays are written as JSON, everything else with str().
+    """
+    if value is None:
+        return None
+    if type_code in JSON_OIDS or isinstance(value, (list, dict)):
+        return json.dumps(value, default=str)
+    return str(value)
+
+
+def to_array(values, type_code, numeric_as_float=False):
+    """
+    Converts one fetched column to a typed NumPy array when its type allows it.
+    Integer columns with NULLs become float64 with NaN, timestamps are stored as naive UTC.
+    numeric columns stay a list of Decimal unless numeric_as_float is set, float64 loses precision.
+
+    :param values: A sequence of column values
+    :param type_code: Postgres type oid from the cursor description
+    :param numeric_as_float: Convert numeric columns to float64
+    :return: A NumPy array, or a list for types without a compact representation
+    """
+    import numpy as np
+
+    if type_code in INT_OIDS:
+        if None in values:
+            return np.array(values, dtype=np.float64)
+        return np.array(values, dtype=np.int64)
+    if type_code in FLOAT_OIDS or (numeric_as_float and type_code in NUMERIC_OIDS):
+        return np.array(values, dtype=np.float64)
+    if type_code in BOOL_OIDS:
+        if None in values:
+            return np.array(values, dtype=object)
+        return np.array(values, dtype=bool)
+    if type_code in DATE_OIDS:
+        return np.array(values, dtype='datetime64[D]')
+    if type_code in TIMESTAMP_OIDS:
+        return np.array([value.astimezone(timezone.utc).replace(tzinfo=None)
+                         if isinstance(value, datetime) and value.tzinfo else value
+                         for value in values], dtype='datetime64[us]')
+    return list(values)
+
+
+class RowView:
+    """
+    Lazy view on one row of a TupleResult or ColumnResult.
+    Values are read from the result on access, by attribute, column name or position.
+    """
+    __slots__ = ('_result', '_position')
+
+    def __init__(self, result, position):
+        self._result = result
+        self._position = position
+
+    def __getattr__(self, name):
+        try:
+            column = self._result.index[name]
+        except KeyError:
+            raise AttributeError(name) from None
+        return self._result.value(self._position, column)
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            key = self._result.index[key]
+        return self._result.value(self._position, key)
+
+    def __len__(self):
+        return len(self._result.columns)
+
+    def __iter__(self):
+        for column in range(len(self._result.columns)):
+            yield self._result.value(self._position, column)
+
+    def _asdict(self):
+        return dict(zip(self._result.columns, self))
+
+    def __repr__(self):
+        return f"RowView({self._asdict()})"
+
+
+class TupleResult:
+    """
+    Rows fetched as plain tuples sharing a single column index.
+
+    Attributes:
+        columns: Tuple of column names.
+        index: Dict mapping column name to tuple position.
+        rows: List of tuples.
+    """
+
+    def __init__(self, columns, rows):
+        self.columns = tuple(columns)
+        self.index = {name: position for position, name in enumerate(self.columns)}
+        self.rows = rows
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __iter__(self):
+        for position in range(len(self.rows)):
+            yield RowView(self, position)
+
+    def value(self, position, column):
+        return self.rows[position][column]
+
+    def row(self, position):
+        return RowView(self, position)
+
+
+class ColumnResult:
+    """
+    Rows fetched column oriented, one NumPy array or list per column.
+
+    Attributes:
+        columns: Tuple of column names.
+        index: Dict mapping column name to column position.
+        data: List of column arrays, in the order of columns.
+    """
+
+    def __init__(self, columns, data):
+        self.columns = tuple(columns)
+        self.index = {name: position for position, name in enumerate(self.columns)}
+        self.data = data
+
+    def __len__(self):
+        return len(self.data[0]) if self.data else 0
+
+    def __iter__(self):
+        for position in range(len(self)):
+            yield RowView(self, position)
+
+    def __getitem__(self, name):
+        return self.data[self.index[name]]
+
+    def value(self, position, column):
+        return self.data[column][position]
+
+    def row(self, position):
+        return RowView(self, position)
+
+    def to_dict(self):
+        return dict(zip(self.columns, self.data))
 
 
 def get_query(query):
@@ -73,19 +338,28 @@ def get_deploy(query):
 class DatabaseConnection:
     """Manage PostgreSQL database connection and operations."""
 
-    def __init__(self, config):
+    def __init__(self, config=None):
         """
         Initialize the database connection.
 
         Parameters:
-        - config (dict): Database configuration including host, port, database, user, and password.
+        - config (dict, optional): Database configuration including host, port, database, user, and password.
+          Defaults to main.config.db_config, resolved when connecting.
         """
         self.config = config
         self.connection = None
+        self._in_transaction = False
         self._ensure_connection()
 
     def _ensure_connection(self):
         """Ensures that the database connection is established."""
+        if self._in_transaction:
+            # A new connection would run the rest of the transaction in autocommit mode
+            raise DatabaseOperationError('Connection lost inside a transaction, it has been rolled back.')
+
+        if self.config is None:
+            from main.config import db_config
+            self.config = db_config
 
         for attempt in range(RECONNECT_ATTEMPTS):
             try:
@@ -177,6 +451,10 @@ class DatabaseConnection:
 
                 logger.error(f"{fetch}: {query}-{error}")
 
+                # Inside a transaction the error must reach transaction() so it rolls back
+                if self._in_transaction:
+                    raise
+
             return results
 
     def fetch_one_row(self, sql, args=None, dict_cursor=False):
@@ -244,6 +522,282 @@ class DatabaseConnection:
                     for row in result_set:
                         yield row
 
+    @contextmanager
+    def transaction(self):
+        """
+        Run the statements of the with block in a single transaction.
+        Commits when the block succeeds, rolls back and re-raises on any error.
+
+        Example usage:
+            with db_conn.transaction():
+                bulk.insert_dynamic(header=header, template=template, data=data)
+                db_conn.insert_data("etl.job_history", job)
+        """
+        if self.connection.closed != 0:
+            self._ensure_connection()
+
+        self.connection.autocommit = False
+        self._in_transaction = True
+        try:
+            yield self
+            self.connection.commit()
+        except Exception:
+            if self.connection.closed == 0:
+                self.connection.rollback()
+            raise
+        finally:
+            self._in_transaction = False
+            if self.connection.closed == 0:
+                self.connection.autocommit = True
+
+    @contextmanager
+    def _server_cursor(self, prefix):
+        """
+        Opens a named server side cursor that streams rows from the server.
+        Outside transaction() the read runs in its own transaction, a WITH HOLD cursor in
+        autocommit would be fully materialized by the server before the first fetch.
+        """
+        if self.connection.closed != 0:
+            # Raises inside a transaction instead of reconnecting
+            self._ensure_connection()
+
+        name = f"{prefix}_{uuid.uuid4().hex}"
+        if self._in_transaction:
+            with self.connection.cursor(name=name, withhold=True) as cursor:
+                yield cursor
+            return
+
+        self.connection.autocommit = False
+        try:
+            with self.connection.cursor(name=name) as cursor:
+                yield cursor
+            self.connection.commit()
+        except Exception:
+            if self.connection.closed == 0:
+                self.connection.rollback()
+            raise
+        finally:
+            if self.connection.closed == 0:
+                self.connection.autocommit = True
+
+    def fetch_tuples(self, sql, args=None, fetch_size=COMPACT_FETCH_SIZE):
+        """
+        Execute a select statement and fetch all rows as plain tuples with one shared column index.
+        Avoids the namedtuple class per query and the dict per row of execute_query.
+
+        :param sql: A string representing the sql statment to be executed
+        :param args: A dictionary or sequence representing the arguments passed to the sql statement
+        :param fetch_size: Number of rows fetched from the server per round trip
+        :return: TupleResult
+        """
+        rows = []
+        with self._server_cursor("tuples") as cursor:
+            cursor.itersize = fetch_size
+            logger.debug(cursor.mogrify(sql, args))
+            cursor.execute(sql, args)
+            while True:
+                result_set = cursor.fetchmany(fetch_size)
+                if not result_set:
+                    break
+                rows.extend(result_set)
+            columns = [column.name for column in cursor.description]
+
+        return TupleResult(columns, rows)
+
+    def fetch_batches(self, sql, args=None, fetch_size=COMPACT_FETCH_SIZE):
+        """
+        Generator that executes a select statement on a server side cursor and yields
+        one TupleResult per fetch, so only fetch_size rows are held in memory at a time.
+
+        :param sql: A string representing the sql statment to be executed
+        :param args: A dictionary or sequence representing the arguments passed to the sql statement
+        :param fetch_size: Number of rows fetched from the server per batch
+        """
+        with self._server_cursor("batches") as cursor:
+            cursor.itersize = fetch_size
+            logger.debug(cursor.mogrify(sql, args))
+            cursor.execute(sql, args)
+            columns = None
+            while True:
+                result_set = cursor.fetchmany(fetch_size)
+                if not result_set:
+                    break
+                if columns is None:
+                    columns = [column.name for column in cursor.description]
+                yield TupleResult(columns, result_set)
+
+    def fetch_columns(self, sql, args=None, typed=True, numeric_as_float=False, fetch_size=COMPACT_FETCH_SIZE):
+        """
+        Execute a select statement and fetch all rows column oriented.
+        Integer, float, boolean, date and timestamp columns are stored as typed NumPy arrays, other columns as lists.
+        Integer columns with NULLs become float64 with NaN. numeric columns stay lists of Decimal,
+        numeric_as_float converts them to float64 at the cost of precision.
+        Rows are converted one fetch at a time so no per-row objects are kept.
+
+        :param sql: A string representing the sql statment to be executed
+        :param args: A dictionary or sequence representing the arguments passed to the sql statement
+        :param typed: Store NumPy arrays for the supported types, lists only if False
+        :param numeric_as_float: Store numeric columns as float64 arrays instead of lists of Decimal
+        :param fetch_size: Number of rows fetched from the server per round trip
+        :return: ColumnResult
+        """
+        chunks = None
+        with self._server_cursor("columns") as cursor:
+            cursor.itersize = fetch_size
+            logger.debug(cursor.mogrify(sql, args))
+            cursor.execute(sql, args)
+            while True:
+                result_set = cursor.fetchmany(fetch_size)
+                if chunks is None:
+                    description = cursor.description
+                    chunks = [[] for _ in description]
+                if not result_set:
+                    break
+                for position, values in enumerate(zip(*result_set)):
+                    if typed:
+                        chunks[position].append(to_array(values, description[position].type_code, numeric_as_float))
+                    else:
+                        chunks[position].append(list(values))
+
+        data = []
+        for position, column_chunks in enumerate(chunks):
+            if typed and column_chunks and not isinstance(column_chunks[0], list):
+                import numpy as np
+                data.append(np.concatenate(column_chunks))
+            elif typed and not column_chunks:
+                data.append(to_array([], description[position].type_code, numeric_as_float))
+            else:
+                data.append([value for chunk in column_chunks for value in chunk])
+
+        return ColumnResult([column.name for column in description], data)
+
+    def export_csv(self, sql, file_path, args=None, header=True, delimiter=','):
+        """
+        Export the result of a query to a CSV file with COPY (query) TO STDOUT.
+        Rows are streamed by the server straight into the file, nothing is held in memory.
+
+        :param sql: A string representing the select statement to be exported
+        :param file_path: Path of the CSV file to write
+        :param args: A dictionary or sequence representing the arguments passed to the sql statement
+        :param header: Whether to write the column names as the first line
+        :param delimiter: Single character used to separate the fields
+        :return: ExportStats for the export
+        """
+        if self.connection.closed != 0:
+            self._ensure_connection()
+
+        rss_before_mb = current_rss_mb()
+        start_time = time.perf_counter()
+        with self.connection.cursor() as cursor:
+            query = cursor.mogrify(sql, args).decode("utf-8")
+            copy_sql = f"COPY ({query}) TO STDOUT WITH (FORMAT csv, HEADER {str(header).lower()}, DELIMITER '{delimiter}')"
+            logger.debug(f"Executing SQL: {copy_sql}")
+            with open(file_path, mode='w', encoding='utf-8', buffering=EXPORT_BUFFER_SIZE) as file:
+                cursor.copy_expert(copy_sql, file, size=EXPORT_BUFFER_SIZE)
+            rows = cursor.rowcount
+
+        return export_stats(file_path, rows, start_time, rss_before_mb)
+
+    def export_parquet(self, sql, file_path, args=None, row_group_size=EXPORT_ROW_GROUP_SIZE, compression='snappy'):
+        """
+        Export the result of a query to a Parquet file through a server side cursor.
+        Only one row group of rows is held in memory at a time.
+
+        :param sql: A string representing the select statement to be exported
+        :param file_path: Path of the Parquet file to write
+        :param args: A dictionary or sequence representing the arguments passed to the sql statement
+        :param row_group_size: Number of rows fetched and written per Parquet row group
+        :param compression: Parquet compression codec
+        :return: ExportStats for the export
+        """
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        rss_before_mb = current_rss_mb()
+        start_time = time.perf_counter()
+        rows = 0
+        writer = None
+        try:
+            with self._server_cursor("export") as cursor:
+                cursor.itersize = row_group_size
+                logger.debug(cursor.mogrify(sql, args))
+                cursor.execute(sql, args)
+                schema = None
+                while True:
+                    result_set = cursor.fetchmany(row_group_size)
+                    if schema is None:
+                        # Named cursors only have a description after the first fetch
+                        schema, text_columns = arrow_schema(cursor.description)
+                        writer = pq.ParquetWriter(file_path, schema, compression=compression)
+                    if not result_set:
+                        break
+
+                    columns = list(zip(*result_set))
+                    for position, type_code in text_columns.items():
+                        columns[position] = [to_text(value, type_code) for value in columns[position]]
+                    table = pa.Table.from_arrays(
+                        [pa.array(column, type=field.type) for column, field in zip(columns, schema)],
+                        schema=schema
+                    )
+                    writer.write_table(table, row_group_size=row_group_size)
+                    rows += len(result_set)
+        finally:
+            if writer is not None:
+                writer.close()
+
+        return export_stats(file_path, rows, start_time, rss_before_mb)
+
+    def export_parallel(self, table, key_column, file_dir, columns='*', where=None, partitions=4,
+                        file_format='parquet', **kwargs):
+        """
+        Export a table by splitting it in key ranges, each range exported on its own connection.
+
+        :param table: Table name, e.g. "data.client"
+        :param key_column: Numeric column used to split the table in ranges, e.g. "id"
+        :param file_dir: Directory the part files are written to
+        :param columns: Column list of the select statement
+        :param where: Optional extra filter, e.g. "is_active"
+        :param partitions: Number of key ranges and connections
+        :param file_format: 'parquet' or 'csv'
+        :param kwargs: Extra arguments passed to export_parquet or export_csv
+        :return: A list of ExportStats, one per part file
+        """
+        if file_format not in ('parquet', 'csv'):
+            raise ValueError("file_format must be 'parquet' or 'csv'")
+
+        filter_sql = f" AND ({where})" if where else ""
+        bounds = self.fetch_one_row(
+            f"SELECT min({key_column}) AS low, max({key_column}) AS high FROM {table} WHERE true{filter_sql}"
+        ).query_data
+        if bounds is None or bounds.low is None:
+            return []
+
+        step = (bounds.high - bounds.low) // partitions + 1
+        ranges = [(bounds.low + step * part, bounds.low + step * (part + 1)) for part in range(partitions)]
+        table_file_name = table.replace('.', '_')
+
+        def export_range(part):
+            low, high = ranges[part]
+            sql = f"SELECT {columns} FROM {table} WHERE {key_column} >= %s AND {key_column} < %s{filter_sql}"
+            file_path = os.path.join(file_dir, f"{table_file_name}_part{part:04d}.{file_format}")
+            db = DatabaseConnection(self.config)
+            try:
+                if file_format == 'parquet':
+                    return db.export_parquet(sql, file_path, args=(low, high), **kwargs)
+                return db.export_csv(sql, file_path, args=(low, high), **kwargs)
+            finally:
+                db.close()
+
+        start_time = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=partitions) as executor:
+            results = list(executor.map(export_range, range(partitions)))
+
+        seconds = time.perf_counter() - start_time
+        rows = sum(stats.rows for stats in results)
+        logger.info(f"Exported {rows} rows of {table} in {partitions} parts in {seconds:.2f}s "
+                    f"({rows / seconds if seconds else 0:.0f} rows/s, process peak RSS {peak_rss_mb():.1f} MB)")
+        return results
+
     def close(self):
         """Closes the database connection."""
         if self.connection:
@@ -262,6 +816,8 @@ class DatabaseConnection:
         else:
             logger.debug("""sql to be executed: {}""".format(sql))
 
+        from pandas.io import sql as psql
+
         return psql.read_sql(sql, con=self.connection, params=args)
 
 
@@ -425,7 +981,7 @@ class BulkDb(object):
                 exec_block = BlockList(db=self.db, header=header, template=template, data=block_data,
                                        return_id=self.inserted_count)
                 total_inserted += exec_block.execute()
-                print("total_inserted", total_inserted)
+                logger.debug(f"total_inserted {total_inserted}")
 
         return total_inserted
 
@@ -463,6 +1019,199 @@ class BulkDb(object):
 
         return total_inserted
 
+    def insert_batches(self, header: str, template: str, batches, block_size: int = 3000):
+        """
+        Performs bulk inserts of batches of tuples, e.g. the output of load_csv_parallel.
+
+        :param header: The SQL insert statement header, e.g., "INSERT INTO test(col1, col2)".
+        :param template: The SQL value template for the insert statement, e.g., "(%s, %s)".
+        :param batches: An iterable of lists of tuples.
+        :param block_size: The number of rows to insert in each transaction block. Default is 3000.
+        """
+        total_inserted = 0
+        for batch in batches:
+            if batch:
+                total_inserted += self.insert_dynamic(header=header, template=template, data=batch,
+                                                      block_size=block_size)
+        return total_inserted
+
+    def copy_batches(self, table: str, batches, columns: str = None):
+        """
+        Loads COPY-ready CSV buffers with COPY FROM STDIN, e.g. the output of load_csv_parallel(as_copy=True).
+
+        :param table: Table name, e.g. "data.client".
+        :param batches: An iterable of CSV formatted strings, empty fields are loaded as NULL.
+        :param columns: Optional column list, e.g. "id, email".
+        :return: The number of rows copied.
+        """
+        column_str = f" ({columns})" if columns else ""
+        copy_sql = f"COPY {table}{column_str} FROM STDIN WITH (FORMAT csv)"
+        total_copied = 0
+        with self.db.connection.cursor() as cursor:
+            for batch in batches:
+                if batch:
+                    cursor.copy_expert(copy_sql, io.StringIO(batch))
+                    total_copied += cursor.rowcount
+                    logger.debug(f"total_copied {total_copied}")
+        return total_copied
+
+
+def file_checksum(file_path):
+    """Returns the sha256 hex digest of a file, read in blocks."""
+    checksum = hashlib.sha256()
+    with open(file_path, mode='rb') as file:
+        for block in iter(lambda: file.read(CHECKSUM_BLOCK_SIZE), b''):
+            checksum.update(block)
+    return checksum.hexdigest()
+
+
+class IncrementalSync:
+    """
+    Incremental extraction driven by a high-water mark stored in the job history table.
+
+    Only rows past the last watermark (or files with an unseen checksum) are extracted, and the
+    load runs in the same transaction as the job history row that advances the watermark.
+    The job history table needs the columns of alter_job_history_watermark.sql.
+
+    Attributes:
+        db: Target database connection, holds the job history table.
+        table_name: Target table name recorded in the job history.
+        tag: Job name recorded in the job history, one watermark per table_name and tag.
+        watermark_type: 'timestamp', 'id' or 'checksum'.
+    """
+
+    def __init__(self, db, table_name, tag, watermark_type, history_table=JOB_HISTORY_TABLE):
+        if watermark_type not in (WATERMARK_TIMESTAMP, WATERMARK_ID, WATERMARK_CHECKSUM):
+            raise ValueError("watermark_type must be 'timestamp', 'id' or 'checksum'")
+        self.db = db
+        self.table_name = table_name
+        self.tag = tag
+        self.watermark_type = watermark_type
+        self.history_table = history_table
+
+    def _lock(self):
+        """
+        Takes a transaction level advisory lock on table_name and tag, so concurrent runs of the
+        same job wait for each other instead of loading the same delta twice.
+        """
+        self.db.fetch_one_row("SELECT pg_advisory_xact_lock(hashtext(%s))",
+                              (f"{self.history_table}:{self.table_name}:{self.tag}",))
+
+    def get_watermark(self):
+        """Returns the watermark of the last loaded job, or None before the first load."""
+        result = self.db.fetch_one_row(
+            f"SELECT watermark_value FROM {self.history_table} "
+            "WHERE table_name = %s AND tag = %s AND watermark_type = %s AND status = %s "
+            "ORDER BY id DESC LIMIT 1",
+            (self.table_name, self.tag, self.watermark_type, STATUS_LOADED)
+        ).query_data
+        if result is None or result.watermark_value is None:
+            return None
+
+        if self.watermark_type == WATERMARK_ID:
+            return int(result.watermark_value)
+        if self.watermark_type == WATERMARK_TIMESTAMP:
+            return datetime.fromisoformat(result.watermark_value)
+        return result.watermark_value
+
+    def is_loaded(self, checksum):
+        """Returns True if a file with this checksum was already loaded."""
+        return self.db.fetch_one_row(
+            f"SELECT 1 AS loaded FROM {self.history_table} "
+            "WHERE table_name = %s AND tag = %s AND watermark_type = %s AND watermark_value = %s AND status = %s "
+            "LIMIT 1",
+            (self.table_name, self.tag, WATERMARK_CHECKSUM, checksum, STATUS_LOADED)
+        ).query_data is not None
+
+    def _save_watermark(self, watermark, row_count, file_name=None):
+        if watermark is None:
+            raise DatabaseOperationError(f"{self.table_name}: refusing to save a NULL watermark")
+
+        data = {
+            "table_name": self.table_name,
+            "tag": self.tag,
+            "file_name": file_name,
+            "status": STATUS_LOADED,
+            "watermark_type": self.watermark_type,
+            "watermark_value": watermark if isinstance(watermark, str) else str(watermark),
+            "row_count": row_count
+        }
+        self.db.insert_data(self.history_table, data)
+
+    def sync_table(self, source_db, source_table, column, load, columns='*', batch_size=COMPACT_FETCH_SIZE):
+        """
+        Extract the rows of source_table past the watermark and load them.
+        The delta is streamed from a server side cursor, load is called once per batch of at most
+        batch_size rows, all inside the transaction that saves the new watermark.
+        With a timestamp watermark, rows committed later with an older updated_at are not picked up.
+
+        :param source_db: Source DatabaseConnection, may be the same as the target.
+        :param source_table: Source table name, e.g. "data.client"
+        :param column: Watermark column, an updated_at timestamp or a monotonic id. Must be in columns.
+        :param load: Callable load(db, rows) loading one TupleResult batch into the target inside the transaction.
+        :param columns: Column list of the extract statement.
+        :param batch_size: Number of rows fetched from the source and passed to load per call.
+        :return: The number of rows loaded.
+
+        Example usage:
+            sync = IncrementalSync(db_conn, "data.client", "client sync", WATERMARK_TIMESTAMP)
+            sync.sync_table(source_db, "source.client", "updated_at",
+                            lambda db, rows: BulkDb(db, inserted_count=False).insert_dynamic(
+                                header="insert into data.client", template="(%s, %s, %s)", data=rows.rows))
+        """
+        if self.watermark_type == WATERMARK_CHECKSUM:
+            raise ValueError("sync_table needs a 'timestamp' or 'id' watermark")
+
+        with self.db.transaction():
+            self._lock()
+            watermark = self.get_watermark()
+            # Rows with a NULL watermark column can never be past the mark, they are not extracted
+            if watermark is None:
+                sql, args = f"SELECT {columns} FROM {source_table} WHERE {column} IS NOT NULL ORDER BY {column}", None
+            else:
+                sql, args = f"SELECT {columns} FROM {source_table} WHERE {column} > %s ORDER BY {column}", (watermark,)
+
+            row_count = 0
+            new_watermark = None
+            for rows in source_db.fetch_batches(sql, args, fetch_size=batch_size):
+                load(self.db, rows)
+                row_count += len(rows)
+                new_watermark = rows.rows[-1][rows.index[column]]
+
+            if not row_count:
+                logger.info(f"{self.table_name}: no rows past watermark {watermark}")
+                return 0
+
+            self._save_watermark(new_watermark, row_count)
+
+        logger.info(f"{self.table_name}: loaded {row_count} rows, watermark {watermark} -> {new_watermark}")
+        return row_count
+
+    def sync_file(self, file_path, load):
+        """
+        Load a file unless a file with the same checksum was already loaded.
+
+        :param file_path: Path of the file to load.
+        :param load: Callable load(db, file_path) loading the file inside the transaction, returns the row count.
+        :return: The number of rows loaded, 0 if the file was skipped.
+        """
+        if self.watermark_type != WATERMARK_CHECKSUM:
+            raise ValueError("sync_file needs a 'checksum' watermark")
+
+        checksum = file_checksum(file_path)
+        file_name = os.path.basename(file_path)
+        with self.db.transaction():
+            self._lock()
+            if self.is_loaded(checksum):
+                logger.info(f"{self.table_name}: {file_name} already loaded, skipping")
+                return 0
+
+            row_count = load(self.db, file_path)
+            self._save_watermark(checksum, row_count, file_name=file_name)
+
+        logger.info(f"{self.table_name}: loaded {row_count} rows from {file_name}")
+        return row_count
+
 
 def load_csv(file_path, ignore_header=True):
     data = []
@@ -478,11 +1227,150 @@ def load_csv(file_path, ignore_header=True):
             data.append(row)
     return data
 
+def to_bool(value):
+    """CSV converter for boolean columns, e.g. 'True', 't', '1' or 'yes'."""
+    return value.strip().lower() in TRUE_VALUES
+
+
+def split_csv(file_path, chunk_size=CSV_CHUNK_SIZE, ignore_header=True):
+    """
+    Splits a CSV file in byte ranges ending on a record boundary.
+    A newline only ends a record when an even number of quotes precede it, so ranges
+    never split a quoted field that contains newlines.
+
+    :return: A list of (start, end) byte offsets.
+    """
+    ranges = []
+    with open(file_path, mode='rb') as file:
+        size = os.fstat(file.fileno()).st_size
+        if size == 0:
+            return ranges
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            start = 0
+            if ignore_header:
+                line_end = mapped.find(b'\n')
+                start = size if line_end == -1 else line_end + 1
+
+            quotes = mapped[:start].count(b'"')
+            while start < size:
+                end = min(start + chunk_size, size)
+                quotes += mapped[start:end].count(b'"')
+                # Move end to the next newline outside quotes, escaped quotes ("") keep the count even
+                while end < size and (mapped[end - 1] != ord('\n') or quotes % 2):
+                    line_end = mapped.find(b'\n', end)
+                    next_end = size if line_end == -1 else line_end + 1
+                    quotes += mapped[end:next_end].count(b'"')
+                    end = next_end
+                ranges.append((start, end))
+                start = end
+    return ranges
+
+
+def csv_field_count(file_path):
+    """Returns the number of fields of the first record of a CSV file."""
+    with open(file_path, mode='r', encoding='utf-8', newline='') as file:
+        return len(next(csv.reader(file), []))
+
+
+def parse_csv_range(file_path, start, end, converters=None, as_copy=False, field_count=None):
+    """
+    Parses and type converts one byte range of a CSV file, runs in a worker process.
+    Empty fields become None, like load_csv.
+
+    :param converters: Optional list of callables, one per column, None keeps the string. Must be picklable.
+    :param as_copy: Return a COPY-ready CSV string instead of a list of tuples.
+    :param field_count: Expected number of fields per record, a ValueError is raised on any other count.
+    """
+    with open(file_path, mode='rb') as file:
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            text = mapped[start:end].decode('utf-8')
+
+    reader = csv.reader(io.StringIO(text, newline=''), strict=True)
+    rows = []
+    while True:
+        try:
+            row = next(reader, None)
+        except csv.Error as error:
+            raise ValueError(f"{file_path}: bytes {start}-{end} do not hold whole records: {error}") from error
+        if row is None:
+            break
+        if not row:
+            continue
+        if field_count is not None and len(row) != field_count:
+            raise ValueError(f"{file_path}: record {reader.line_num} of bytes {start}-{end} has {len(row)} fields, "
+                             f"expected {field_count}")
+        if converters:
+            rows.append(tuple([None if not value else (convert(value) if convert else value)
+                               for convert, value in zip(converters, row)]))
+        else:
+            rows.append(tuple([value if value else None for value in row]))
+
+    if not as_copy:
+        return rows
+
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator='\n').writerows(rows)
+    return buffer.getvalue()
+
+
+def load_csv_parallel(file_path, converters=None, ignore_header=True, workers=None, chunk_size=CSV_CHUNK_SIZE,
+                      ordered=True, as_copy=False):
+    """
+    Generator that parses a large CSV file on a pool of worker processes.
+    The file is split at record boundaries through a memory map, each worker parses and converts
+    one range and the batches are yielded in file order, or as soon as ready if ordered is False.
+    At most two batches per worker are in flight. Every record must have as many fields as the
+    first line, otherwise the batch raises ValueError.
+
+    :param file_path: Path of the CSV file.
+    :param converters: Optional list of picklable callables, one per column, e.g. [int, str, str, to_bool].
+    :param ignore_header: Skip the first line.
+    :param workers: Number of worker processes, defaults to the number of cores.
+    :param chunk_size: Approximate number of bytes per batch.
+    :param ordered: Yield batches in file order.
+    :param as_copy: Yield COPY-ready CSV strings for BulkDb.copy_batches instead of lists of tuples.
+
+    Example usage:
+        batches = load_csv_parallel(file_path, converters=[int, str, None, to_bool, str, str, str, str])
+        BulkDb(db_conn, inserted_count=False).insert_batches(header=header, template=template, batches=batches)
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    ranges = split_csv(file_path, chunk_size=chunk_size, ignore_header=ignore_header)
+    field_count = csv_field_count(file_path)
+    workers = workers or os.cpu_count() or 1
+    max_pending = workers * 2
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = []
+        for start, end in ranges:
+            pending.append(executor.submit(parse_csv_range, file_path, start, end, converters, as_copy,
+                                           field_count))
+            while len(pending) >= max_pending:
+                yield from _completed_batches(pending, ordered)
+
+        while pending:
+            yield from _completed_batches(pending, ordered)
+
+
+def _completed_batches(pending, ordered):
+    """Removes and yields the next ready batches of pending futures."""
+    if ordered:
+        yield pending.pop(0).result()
+        return
+
+    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+    for future in done:
+        pending.remove(future)
+        yield future.result()
+
+
 # Example Usage
 if __name__ == '__main__':
+    configure_logging()
+    register_adapters()
 
-
-    db_conn = DatabaseConnection(db_config)
+    db_conn = DatabaseConnection()
 
     data = {
         "id": 1,
@@ -552,6 +1440,12 @@ if __name__ == '__main__':
     #                             data=data_l)
     # print(ret)
     # #
+    # batches = load_csv_parallel(file_path, converters=[int, str, None, to_bool, str, str, str, str])
+    # ret = bulk.insert_batches(header="insert into data.client",
+    #                           template="(%s, %s, %s, %s,%s, %s,%s, %s)",
+    #                           batches=batches)
+    # print(ret)
+    # #
     # sql = get_query("get_client_data")
     # print(sql)
     # data = db_conn.fetch_all_rows(sql)